@@ -27,6 +27,7 @@ class Config:
         self.conditional_opt = args.conditional_opt
         self.table_opt = args.table_opt
         self.incremental = args.incremental
+        self.one_shot_complete_paths = args.one_shot_complete_paths
         self.output_path = './test-case'
         self.round_robin_parser_paths = args.round_robin_parser_paths
         self.collapse_parser_paths = args.collapse_parser_paths
@@ -95,6 +96,9 @@ class Config:
     def get_incremental(self):
         return self.incremental
 
+    def get_one_shot_complete_paths(self):
+        return self.one_shot_complete_paths
+
     def get_output_json_path(self):
         return self.output_path + '.json'
 
@@ -153,19 +153,18 @@ class ConsolidatedSolver(object):
         self.solver.add(constraint)
 
     def solve(self):
-        start_time = time.time()
+        start_time = time.monotonic_ns()
         Statistics().solver_time.start()
         solver_result = self.solver.check()
         Statistics().num_solver_calls += 1
         Statistics().solver_time.stop()
-        logging.debug("Checked %d paths, result=%s, %f seconds"
-                      % (len(self.paths_data), solver_result,
-                         time.time() - start_time))
+        logging.debug("Checked %d paths, result=%s, %f seconds",
+                      len(self.paths_data), solver_result,
+                      (time.monotonic_ns() - start_time) * 1e-9)
         return solver_result
 
     def flush(self):
-        logging.info("Flushing %d paths"
-                     % (len(self.paths_data),))
+        logging.info("Flushing %d paths", len(self.paths_data))
         if not self.paths_data:
             # If no paths have been added then nothing to do
             return
@@ -207,18 +206,16 @@ class ConsolidatedSolver(object):
 
         self.push(path_id, path_data)
         if not self._try_add_path(path_id, constraints, path_data):
-            logging.info("Failed to add path %d"
-                         % (path_id,))
+            logging.info("Failed to add path %d", path_id)
             self.pop()
             self.flush()
             self.reset()
             self.push(path_id, path_data)
-            logging.info("Flushed existing paths, re-adding path %d"
-                         % (path_id,))
+            logging.info("Flushed existing paths, re-adding path %d",
+                         path_id)
             assert self._try_add_path(path_id, constraints, path_data)
         else:
-            logging.info("Successfully added path %d"
-                         % (path_id,))
+            logging.info("Successfully added path %d", path_id)
 
     def add_path(self, *args, **kwargs):
         # Child should package up path_data and call _add_path.  The
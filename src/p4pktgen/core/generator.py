@@ -33,11 +33,10 @@ def path_tuple(parser_path, control_path):
     )
 
 
-def enough_test_cases():
-    max_test_cases = Config().get_num_test_cases()
+def enough_test_cases(stats, max_test_cases):
     if max_test_cases is None or max_test_cases <= 0:
         return False
-    return Statistics().num_test_cases >= max_test_cases
+    return stats.num_test_cases >= max_test_cases
 
 
 class TestCaseGenerator(object):
@@ -46,6 +45,9 @@ class TestCaseGenerator(object):
         self.top = top
         self.total_switch_time = 0.0
         self.parser_path_edge_count = defaultdict(int)
+        # Built once, so that the statistics are indexed by the same edges that
+        # the control graph DFS walks.
+        self.control_start_node, self.control_graph = self.get_control_graph()
 
         self.test_case_builder = TestCaseBuilder(input_file, top.in_pipeline)
         # TBD: Make this filename specifiable via command line option
@@ -78,7 +80,7 @@ class TestCaseGenerator(object):
         sym_packet = path_solution.sym_packet
         model = path_solution.model
 
-        start_time = time.time()
+        start_time = time.monotonic_ns()
         build_result, test_case, payloads = \
             self.test_case_builder.build_for_path(
                 context, model, sym_packet, path
@@ -93,7 +95,7 @@ class TestCaseGenerator(object):
                 path.is_complete, self.top.in_source_info_to_node_name)
             assert test_result == path_solution.result
 
-        self.total_switch_time += time.time() - start_time
+        self.total_switch_time += (time.monotonic_ns() - start_time) * 1e-9
 
         return (test_case, payloads)
 
@@ -103,12 +105,13 @@ class TestCaseGenerator(object):
             path_solver = PathSolver(self.top, self.top.in_pipeline)
 
         if not path_solver.generate_parser_constraints(parser_path):
-            logging.info("Could not find any packet to satisfy parser path: %s"
-                         "" % (parser_path))
+            logging.info("Could not find any packet to satisfy parser path: %s",
+                         parser_path)
             # Skip unsatisfiable parser paths
             return
 
-        start_node, control_graph = self.get_control_graph()
+        start_node = self.control_start_node
+        control_graph = self.control_graph
         if Config().get_edge_coverage():
             graph_visitor = EdgeCoverageGraphVisitor(path_solver, parser_path,
                                                      results, control_graph)
@@ -126,9 +129,10 @@ class TestCaseGenerator(object):
             self.table_solver.add_path(path_solution)
             return
 
-        pre_sim_time = time.time()
+        pre_sim_time = time.monotonic_ns()
         test_case, packet_list = self.generate_test_case_for_path(path_solution)
-        test_case["time_sec_simulate_packet"] = time.time() - pre_sim_time
+        test_case["time_sec_simulate_packet"] = \
+            (time.monotonic_ns() - pre_sim_time) * 1e-9
 
         self.test_case_writer.write(test_case, packet_list)
         Statistics().num_test_cases += 1
@@ -136,28 +140,32 @@ class TestCaseGenerator(object):
     def generate_test_cases_linearly(self, parser_paths):
         path_solver = PathSolver(self.top, self.top.in_pipeline)
         results = OrderedDict()
+        max_path_test_cases = Config().get_max_test_cases_per_path()
+        # Checked after every solution, so look these up once.
+        stats = Statistics()
+        max_test_cases = Config().get_num_test_cases()
 
         for i_path, parser_path in enumerate(parser_paths):
             self.count_parser_path_edges(parser_path)
-            logging.info("Analyzing parser_path %d of %d: %s"
-                         "" % (i_path, len(parser_paths), parser_path))
+            logging.info("Analyzing parser_path %d of %d: %s",
+                         i_path, len(parser_paths), parser_path)
 
             for path_model in self.iterate_paths_for_parser_path(
                     parser_path, results=results, path_solver=path_solver):
                 for i_solution, path_solution in enumerate(path_model.solutions()):
                     self.process_path_solution(path_solution)
-                    logging.info("Processed %d solutions for path" % (i_solution + 1,))
+                    logging.info("Processed %d solutions for path", i_solution + 1)
 
                     # If we have produced enough test cases overall, enough for this
                     # path, or have exhausted possible packets for this path, move on.
-                    if enough_test_cases() or \
-                            (i_solution + 1) == Config().get_max_test_cases_per_path():
+                    if enough_test_cases(stats, max_test_cases) \
+                            or (i_solution + 1) == max_path_test_cases:
                         break
 
-                if enough_test_cases():
+                if enough_test_cases(stats, max_test_cases):
                     break
 
-            if enough_test_cases():
+            if enough_test_cases(stats, max_test_cases):
                 break
 
         return results
@@ -165,6 +173,9 @@ class TestCaseGenerator(object):
     def generate_test_cases_round_robin(self, parser_paths):
         results = OrderedDict()
         max_path_test_cases = Config().get_max_test_cases_per_path()
+        # Checked after every solution, so look these up once.
+        stats = Statistics()
+        max_test_cases = Config().get_num_test_cases()
 
         # Generates PathSolutions for a parser path
         def solution_generator(parser_path):
@@ -174,16 +185,17 @@ class TestCaseGenerator(object):
                     yield path_solution
                     # If we have produced enough test cases overall, enough for this
                     # path, or have exhausted possible packets for this path, move on.
-                    if enough_test_cases() or (i_solution + 1) == max_path_test_cases:
+                    if enough_test_cases(stats, max_test_cases) \
+                            or (i_solution + 1) == max_path_test_cases:
                         break
-                if enough_test_cases():
+                if enough_test_cases(stats, max_test_cases):
                     break
 
         solution_generators = deque()
         for i_path, parser_path in enumerate(parser_paths):
             self.count_parser_path_edges(parser_path)
-            logging.info("Analyzing parser_path %d of %d: %s"
-                         "" % (i_path, len(parser_paths), parser_path))
+            logging.info("Analyzing parser_path %d of %d: %s",
+                         i_path, len(parser_paths), parser_path)
             solution_generators.append(solution_generator(parser_path))
 
         while solution_generators:
@@ -194,12 +206,13 @@ class TestCaseGenerator(object):
                 continue
             self.process_path_solution(path_solution)
             solution_generators.rotate(-1)  # Equivalent to x.append(x.popleft())
-            if enough_test_cases():
+            if enough_test_cases(stats, max_test_cases):
                     break
         return results
 
     def generate_test_cases_for_parser_paths(self, parser_paths):
         Statistics().init()
+        Statistics().init_control_path_edges(self.control_graph.edges)
         self.total_switch_time = 0.0
         self.parser_path_edge_count = defaultdict(int)
 
@@ -212,8 +225,7 @@ class TestCaseGenerator(object):
             self.table_solver.flush()
 
         logging.info("Final statistics on use of control path edges:")
-        Statistics().log_control_path_stats(
-            Statistics().stats_per_control_path_edge, Statistics().num_control_path_edges)
+        Statistics().log_control_path_stats()
         self.test_case_writer.cleanup()
 
         Statistics().dump()
@@ -2,15 +2,25 @@ import time
 
 from p4pktgen.config import Config
 from p4pktgen.core.test_cases import TestPathResult
+from p4pktgen.core.translator import Translator
 
 
 class Path(object):
-    def __init__(self, id, expected_path, parser_path, control_path, is_complete):
+    def __init__(self, id, parser_path, control_path, is_complete):
         self.id = id
-        self.expected_path = expected_path
         self.parser_path = parser_path
         self.control_path = control_path
         self.is_complete = is_complete
+        self._expected_path = None
+
+    @property
+    def expected_path(self):
+        # Built on first use: most paths are only solved, never written out or
+        # logged, so there is no need to pay for the list up front.
+        if self._expected_path is None:
+            self._expected_path = list(
+                Translator.expected_path(self.parser_path, self.control_path))
+        return self._expected_path
 
     def __str__(self):
         return "%d Exp path (len %d+%d=%d) complete_path %s: %s" % (
@@ -44,44 +54,60 @@ class PathModel(object):
         self.time_sec_generate_ingress_constraints = time_sec_generate_ingress_constraints
         self.time_sec_initial_solve = time_sec_initial_solve
 
+    def solution(self, solve_time):
+        """Returns a PathSolution for the model currently held by the path
+        solver, with values fixed for the randomization variables if the path
+        is complete.
+        """
+        # Choose values for randomization variables.
+        random_constraints = []
+        fix_random = self.path.is_complete
+        if fix_random:
+            self.path_solver.push()
+            random_constraints = self.path_solver.fix_random_constraints()
+
+        try:
+            return PathSolution(
+                self.path, self.result,
+                self.path_solver.constraints + [random_constraints],
+                self.path_solver.current_context(),
+                self.path_solver.sym_packet,
+                self.path_solver.solver.model(),
+                time_sec_generate_ingress_constraints=self.time_sec_generate_ingress_constraints,
+                time_sec_solve=solve_time,
+            )
+        finally:
+            # Clear the constraints on the values of the randomization
+            # variables.
+            if fix_random:
+                self.path_solver.pop()
+
     def solutions(self):
         extract_vl_variation = Config().get_extract_vl_variation()
+        max_test_cases_per_path = Config().get_max_test_cases_per_path()
         current_result = self.result
         solve_time = self.time_sec_initial_solve
+
+        if max_test_cases_per_path == 1:
+            # Common case, and the only one supported when consolidating
+            # tables: there is no need to constrain the VL-extraction lengths
+            # and re-solve in search of further solutions.
+            if current_result != TestPathResult.NO_PACKET_FOUND:
+                yield self.solution(solve_time)
+            return
+
         while current_result != TestPathResult.NO_PACKET_FOUND:
             assert current_result == self.result
 
-            # Choose values for randomization variables.
-            random_constraints = []
-            fix_random = self.path.is_complete
-            if fix_random:
-                self.path_solver.push()
-                random_constraints = self.path_solver.fix_random_constraints()
-
-            try:
-                path_solution = PathSolution(
-                    self.path, self.result,
-                    self.path_solver.constraints + [random_constraints],
-                    self.path_solver.current_context(),
-                    self.path_solver.sym_packet,
-                    self.path_solver.solver.model(),
-                    time_sec_generate_ingress_constraints=self.time_sec_generate_ingress_constraints,
-                    time_sec_solve=solve_time,
-                )
-                yield path_solution
-            finally:
-                # Clear the constraints on the values of the randomization
-                # variables.
-                if fix_random:
-                    self.path_solver.pop()
+            yield self.solution(solve_time)
 
             if not self.path_solver.constrain_last_extract_vl_lengths(extract_vl_variation):
                 # Special case: unbounded numbers of test cases are only
                 # safe when we're building up constraints on VL-extraction
                 # lengths, or else we'll loop forever.
-                if not Config().get_max_test_cases_per_path():
+                if not max_test_cases_per_path:
                     break
 
-            time2 = time.time()
+            time2 = time.monotonic_ns()
             current_result = self.path_solver.solve_path()
-            solve_time = time.time()
+            solve_time = (time.monotonic_ns() - time2) * 1e-9
@@ -23,9 +23,28 @@ class PathSolver(object):
     graph edges."""
 
     def __init__(self, p4top, pipeline):
+        self.incremental = Config().get_incremental()
         self.solver = SolverFor('QF_UFBV')
+        # As in ControlGraphVisitor, one-shot solving only applies when
+        # solving incrementally.
+        if self.incremental and Config().get_one_shot_complete_paths():
+            # Complete paths are solved separately, see use_one_shot_solver(),
+            # so favour cheap checks of the many partial paths.
+            self.solver.set('auto_config', False)
+            self.solver.set('relevancy', 0)
+            self.solver.set('arith.propagate_eqs', False)
         self.solver.push()
         self.solver_result = None
+
+        # When not solving incrementally, holds the constraints of the current
+        # parser path.  See reset_solver().
+        self.parser_solver = None
+
+        # While a one-shot solver is in use, holds the incremental solver and
+        # the depth of self.constraints at which it was set aside.  See
+        # use_one_shot_solver().
+        self.incremental_solver = None
+        self.one_shot_depth = None
         self.hlir = p4top.hlir
         self.pipeline = pipeline
         self.translator = Translator(p4top, pipeline)
@@ -47,6 +66,16 @@ class PathSolver(object):
         # First element is constraints added by entire parser path.
         self.constraints = [[]]
 
+        # Polarity of each atom asserted along the control path, keyed by z3
+        # AST id, and the atoms added by each transition.  Used to spot
+        # duplicate and directly contradictory constraints without a solver
+        # call.  See filter_constraints().
+        self.constraint_atoms = {}  # {atom_id: is_positive}
+        self.constraint_atom_history = [[]]
+        # Set when the constraints of the latest transition are found to be
+        # unsatisfiable by filter_constraints().
+        self.trivially_unsat = False
+
         # Increments whenever considering a control path (partial or complete)
         self.path_id = -1
 
@@ -55,19 +84,56 @@ class PathSolver(object):
 
     def push(self):
         self.path_id += 1
-        self.solver.push()
+        # Solver scopes are only used when solving incrementally: opening one
+        # switches z3 over to its incremental solver, which forgoes some of the
+        # preprocessing available to one-shot solves.
+        if self.incremental:
+            self.solver.push()
         self.context_history_lens.append(len(self.context_history))
         self.result_history.append([])
         self.constraints.append([])
+        self.constraint_atom_history.append([])
 
     def pop(self):
-        if Config().get_incremental():
+        if self.incremental_solver is not None \
+                and len(self.constraints) == self.one_shot_depth:
+            self.solver = self.incremental_solver
+            self.incremental_solver = None
+            self.one_shot_depth = None
+
+        if self.incremental:
             self.solver.pop()
 
         old_len = self.context_history_lens.pop()
         self.context_history = self.context_history[:old_len]
         self.result_history.pop()
         self.constraints.pop()
+        for atom_id in self.constraint_atom_history.pop():
+            del self.constraint_atoms[atom_id]
+
+    def reset_solver(self):
+        """Replaces the solver with a copy of the parser-path solver, for use
+        before solving each control path when not solving incrementally.  This
+        saves re-adding the parser path's constraints for every control
+        path."""
+        assert not self.incremental
+        self.solver = self.parser_solver.translate(self.parser_solver.ctx)
+
+    def use_one_shot_solver(self):
+        """Moves solving of the current path to a new solver holding all
+        constraints along the path, for use on complete paths when solving
+        incrementally.  A solver that has never had a scope opened can apply
+        preprocessing that incremental solving disables.  The incremental
+        solver is restored when backtracking from the current path."""
+        assert self.incremental
+        assert self.incremental_solver is None
+        solver = SolverFor('QF_UFBV')
+        for cs in self.constraints:
+            if len(cs) > 0:
+                solver.add(And(cs))
+        self.incremental_solver = self.solver
+        self.one_shot_depth = len(self.constraints)
+        self.solver = solver
 
     def init_context(self):
         assert len(self.context_history) == 1
@@ -125,7 +191,7 @@ class PathSolver(object):
             else:
                 break
 
-        logging.debug("Other constraints: {}".format(other_constraints))
+        logging.debug("Other constraints: %s", other_constraints)
         if other_constraints:
             constraints.append(Not(Or(other_constraints)))
 
@@ -160,7 +226,7 @@ class PathSolver(object):
                 break
 
         assert i_first_component is not None
-        logging.debug("Other constraints (Composite): {}".format(other_constraints))
+        logging.debug("Other constraints (Composite): %s", other_constraints)
         if other_constraints:
             constraints.append(Not(Or(other_constraints)))
 
@@ -176,7 +242,7 @@ class PathSolver(object):
         parser_constraints_gen_timer = Timer('parser_constraints_gen')
         parser_constraints_gen_timer.start()
 
-        if Config().get_incremental():
+        if self.incremental:
             self.solver.pop()
             self.solver.push()
 
@@ -187,8 +253,7 @@ class PathSolver(object):
         # XXX: make this work for multiple parsers
         parser = self.hlir.parsers['parser']
         pos = BitVecVal(0, 32)
-        logging.info('path = {}'.format(', '.join(
-            [str(n) for n in list(parser_path)])))
+        logging.info('path = %s', parser_path)
         for path_transition in parser_path:
             assert isinstance(path_transition, ParserTransition) \
                     or isinstance(path_transition, ParserCompositeTransition) \
@@ -196,7 +261,7 @@ class PathSolver(object):
 
             node = path_transition.src
             next_node = path_transition.dst
-            logging.debug('{}\tpos = {}'.format(path_transition, pos))
+            logging.debug('%s\tpos = %s', path_transition, pos)
             new_pos = pos
             parse_state = parser.parse_states[node]
             context = self.current_context()
@@ -292,33 +357,37 @@ class PathSolver(object):
             context.set_field_value('standard_metadata', 'parser_error',
                                     self.error_bitvec(fail))
         constraints.extend(self.sym_packet.get_packet_constraints())
-        self.solver.add(And(constraints))
+        if self.incremental:
+            solver = self.solver
+        else:
+            solver = self.parser_solver = SolverFor('QF_UFBV')
+        solver.add(And(constraints))
         self.constraints[0] = constraints
 
         parser_constraints_gen_timer.stop()
-        logging.info('Generate parser constraints: %.3f sec' %
-                     (parser_constraints_gen_timer.get_time()))
+        logging.info('Generate parser constraints: %.3f sec',
+                     parser_constraints_gen_timer.get_time())
 
         Statistics().solver_time.start()
-        result = self.solver.check()
+        result = solver.check()
         Statistics().num_solver_calls += 1
         Statistics().solver_time.stop()
 
-        if not Config().get_incremental():
-            self.solver.reset()
-
         return result == sat
 
     def add_path_constraints(self, control_path):
         assert len(control_path) == len(self.context_history_lens) \
-               or not Config().get_incremental()
+               or not self.incremental
         self.context_history.append(copy.copy(self.current_context()))
         context = self.current_context()
         constraints = []
 
         # XXX: very ugly to split parsing/control like that, need better solution
-        logging.info('control_path = {}'.format(control_path))
+        logging.info('control_path = %s', control_path)
 
+        # Constraints are only generated for the newest edge.  When solving
+        # incrementally, those for the rest of the path were asserted in the
+        # enclosing solver scopes as the DFS extended the path.
         if len(control_path) > 0:
             transition = control_path[-1]
             constraints.extend(
@@ -334,9 +403,12 @@ class PathSolver(object):
             )
         )
 
-        if not Config().get_incremental():
-            # Add constraints from each previous path node
-            for cs in self.constraints:
+        constraints = self.filter_constraints(constraints)
+
+        if not self.incremental:
+            # Add constraints from each previous path node.  The parser
+            # constraints are already held by the solver, see reset_solver().
+            for cs in self.constraints[1:]:
                 if len(cs) > 0:
                     self.solver.add(And(cs))
         self.constraints[-1].extend(constraints)
@@ -346,7 +418,48 @@ class PathSolver(object):
             self.solver.add(And(constraints))
         self.solver_result = None
 
+    def filter_constraints(self, constraints):
+        """Simplifies the constraints added by a transition, dropping any that
+        are trivially true or already asserted along the control path.  Sets
+        trivially_unsat if any are trivially false or directly contradict a
+        constraint already asserted, so that the path can be rejected without
+        a solver call."""
+        self.trivially_unsat = False
+        atom_history = self.constraint_atom_history[-1]
+        filtered = []
+        pending = list(reversed(constraints))
+        while pending:
+            constraint = simplify(pending.pop())
+            if is_true(constraint):
+                continue
+            if is_and(constraint):
+                pending.extend(reversed(constraint.children()))
+                continue
+            if is_false(constraint):
+                self.trivially_unsat = True
+                filtered.append(constraint)
+                continue
+
+            if is_not(constraint):
+                atom, is_positive = constraint.arg(0), False
+            else:
+                atom, is_positive = constraint, True
+            atom_id = atom.get_id()
+            if atom_id in self.constraint_atoms:
+                if self.constraint_atoms[atom_id] != is_positive:
+                    self.trivially_unsat = True
+                    filtered.append(constraint)
+                continue
+            self.constraint_atoms[atom_id] = is_positive
+            atom_history.append(atom_id)
+            filtered.append(constraint)
+        return filtered
+
     def try_quick_solve(self, control_path, is_complete_control_path):
+        """Tries to determine the result of the current path without a
+        solver call, from the structure of the latest transition and the
+        results of its siblings.  Returns None if no conclusion can be drawn,
+        in which case solve_path() must be called."""
         context = self.current_context()
         result = None
         # Can only use quick solve if we are:
@@ -354,6 +467,7 @@ class PathSolver(object):
         #   - not going to record the test-case if successful, i.e. no complete
         #     paths and no error cases.
         if len(control_path) > 0 \
+                and not self.trivially_unsat \
                 and not is_complete_control_path \
                 and len(context.uninitialized_reads) == 0 \
                 and len(context.invalid_header_writes) == 0:
@@ -384,10 +498,13 @@ class PathSolver(object):
         return result
 
     def solve_path(self):
-        Statistics().solver_time.start()
-        self.solver_result = self.solver.check()
-        Statistics().num_solver_calls += 1
-        Statistics().solver_time.stop()
+        if self.trivially_unsat:
+            self.solver_result = unsat
+        else:
+            Statistics().solver_time.start()
+            self.solver_result = self.solver.check()
+            Statistics().num_solver_calls += 1
+            Statistics().solver_time.stop()
 
         context = self.current_context()
         if self.solver_result != sat:
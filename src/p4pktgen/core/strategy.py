@@ -26,26 +26,39 @@ class ParserGraphVisitor(GraphVisitor):
     def __init__(self, hlir):
         super(ParserGraphVisitor, self).__init__()
         self.hlir = hlir
-
-    def count(self, stack_counts, state_name):
-        if state_name != 'sink':
-            state = self.hlir.get_parser_state(state_name)
-            for extract in state.header_stack_extracts:
-                stack_counts[extract] += 1
+        self.stack_sizes = {name: stack.size
+                            for name, stack in hlir.header_stacks.items()}
+        self.collapse_parser_paths = Config().get_collapse_parser_paths()
+        self.state_extracts = {}  # {state_name: (header_stack_name, ...)}
+
+        # Number of extractions for each header stack along the current path,
+        # maintained incrementally as the DFS visits and backtracks.  Each
+        # entry of extracts_history holds the extractions added by one visit.
+        self.stack_counts = defaultdict(int)
+        self.extracts_history = []
+
+    def header_stack_extracts(self, state_name):
+        extracts = self.state_extracts.get(state_name)
+        if extracts is None:
+            extracts = tuple(
+                self.hlir.get_parser_state(state_name).header_stack_extracts)
+            self.state_extracts[state_name] = extracts
+        return extracts
 
     def preprocess_edges(self, path_prefix, onward_edges):
-        # Count the number of extractions for each header stack in the path so
-        # far.
-        stack_counts = defaultdict(int)
-        if len(path_prefix) > 0:
-            self.count(stack_counts, path_prefix[0].src)
-            for e in path_prefix:
-                self.count(stack_counts, e.dst)
-
         edges = onward_edges
 
-        if any(self.hlir.get_header_stack(stack).size < count
-               for stack, count in stack_counts.items()):
+        # path_prefix is always the most recently visited path, so
+        # self.stack_counts holds the number of extractions for each header
+        # stack along it.
+        overflow = False
+        stack_sizes = self.stack_sizes
+        for stack, count in self.stack_counts.items():
+            if stack_sizes[stack] < count:
+                overflow = True
+                break
+
+        if overflow:
             # If the path so far involves an extraction beyond the end of a
             # header stack, the only legal onward transitions are error
             # transitions.  If there are no such transitions, the returned list
@@ -53,18 +66,17 @@ class ParserGraphVisitor(GraphVisitor):
             # path-prefix entirely.
             edges = [edge for edge in edges
                      if isinstance(edge, ParserErrorTransition)]
-        elif Config().get_collapse_parser_paths():
+        elif self.collapse_parser_paths:
             # Collapse any parallel transitions into a single edge with merged
             # constraints.  Note that although the nodes on either side of the
             # new edge are part of the graph, the edge itself is not.
-            good_edges = [edge for edge in edges
-                          if isinstance(edge, ParserTransition)]
-            other_edges = [edge for edge in edges
-                          if not isinstance(edge, ParserTransition)]
-
+            other_edges = []
             good_edges_by_next_state = defaultdict(list)
-            for edge in good_edges:
-                good_edges_by_next_state[edge.next_state_name].append(edge)
+            for edge in edges:
+                if isinstance(edge, ParserTransition):
+                    good_edges_by_next_state[edge.next_state_name].append(edge)
+                else:
+                    other_edges.append(edge)
 
             edges = other_edges
             for grouped_edges in good_edges_by_next_state.values():
@@ -77,13 +89,26 @@ class ParserGraphVisitor(GraphVisitor):
         return edges
 
     def visit(self, path, is_complete_path):
+        # Count the extractions performed by the state the new edge leads to,
+        # and by the start state if this is the first edge.
+        edge = path[-1]
+        extracts = ()
+        if len(path) == 1:
+            extracts += self.header_stack_extracts(edge.src)
+        if edge.dst != 'sink':
+            extracts += self.header_stack_extracts(edge.dst)
+        for extract in extracts:
+            self.stack_counts[extract] += 1
+        self.extracts_history.append(extracts)
+
         if is_complete_path:
             return VisitResult.CONTINUE, path
         else:
             return VisitResult.CONTINUE, None
 
     def backtrack(self):
-        pass
+        for extract in self.extracts_history.pop():
+            self.stack_counts[extract] -= 1
 
 
 class ControlGraphVisitor(GraphVisitor):
@@ -91,27 +116,33 @@ class ControlGraphVisitor(GraphVisitor):
         super(ControlGraphVisitor, self).__init__()
         self.path_solver = path_solver
         self.parser_path = parser_path
+        # Key prefix shared by all results recorded by this visitor.
+        self.parser_path_tuple = tuple(parser_path)
         self.results = results
         self.success_path_count = 0
 
-    def solve_path(self, control_path, is_complete_control_path):
-        expected_path = list(
-            self.path_solver.translator.expected_path(self.parser_path,
-                                                      control_path)
-        )
+        # Config is fixed for the lifetime of the visitor, so look up the
+        # values consulted on every path once here.
+        self.incremental = Config().get_incremental()
+        self.one_shot_complete_paths = \
+            self.incremental and Config().get_one_shot_complete_paths()
+        self.record_statistics = Config().get_record_statistics()
+        self.max_paths_per_parser_path = \
+            Config().get_max_paths_per_parser_path()
 
-        path = Path(self.path_solver.path_id, expected_path,
-                    self.parser_path, control_path, is_complete_control_path)
+    def solve_path(self, control_path, is_complete_control_path):
+        path = Path(self.path_solver.path_id, self.parser_path, control_path,
+                    is_complete_control_path)
 
         logging.info("")
-        logging.info("BEGIN %s" % str(path))
+        logging.info("BEGIN %s", path)
 
-        if not Config().get_incremental():
-            self.path_solver.solver.reset()
+        if not self.incremental:
+            self.path_solver.reset_solver()
 
-        time1 = time.time()
+        time1 = time.monotonic_ns()
         self.path_solver.add_path_constraints(control_path)
-        time2 = time.time()
+        time2 = time.monotonic_ns()
 
         result = self.path_solver.try_quick_solve(control_path, is_complete_control_path)
         if result == TestPathResult.SUCCESS:
@@ -120,65 +151,71 @@ class ControlGraphVisitor(GraphVisitor):
             # Path trivially found to be satisfiable and not complete.
             # No test cases required.
             logging.info("Path trivially found to be satisfiable and not complete.")
-            logging.info("END   %s" % str(path))
+            logging.info("END   %s", path)
             return result, None
 
+        if is_complete_control_path and self.one_shot_complete_paths:
+            self.path_solver.use_one_shot_solver()
         result = self.path_solver.solve_path()
-        time3 = time.time()
+        time3 = time.monotonic_ns()
 
-        logging.info("END   %s: %s" % (str(path), result) )
+        logging.info("END   %s: %s", path, result)
         path_model = PathModel(
             path, result, self.path_solver,
-            time_sec_generate_ingress_constraints=time2 - time1,
-            time_sec_initial_solve=time3-time2
+            time_sec_generate_ingress_constraints=(time2 - time1) * 1e-9,
+            time_sec_initial_solve=(time3 - time2) * 1e-9
         )
         return result, path_model
 
-    def record_stats(self, control_path, is_complete_control_path, result):
-        if result == TestPathResult.SUCCESS and is_complete_control_path:
-            Statistics().avg_full_path_len.record(
-                len(self.parser_path + control_path))
+    def record_result(self, control_path, is_complete_control_path, result):
+        """Records statistics and the result for a solved path, and returns
+        the VisitResult with which the DFS should proceed."""
+        stats = Statistics()
+        complete_success = \
+            result == TestPathResult.SUCCESS and is_complete_control_path
+        if complete_success:
+            stats.avg_full_path_len.record(
+                len(self.parser_path) + len(control_path))
+            stats_per_control_path_edge = stats.stats_per_control_path_edge
             for e in control_path:
-                if Statistics().stats_per_control_path_edge[e] == 0:
-                    Statistics().num_covered_edges += 1
-                Statistics().stats_per_control_path_edge[e] += 1
+                edge_id = e.edge_id
+                if stats_per_control_path_edge[edge_id] == 0:
+                    stats.num_covered_edges += 1
+                stats_per_control_path_edge[edge_id] += 1
         if result == TestPathResult.NO_PACKET_FOUND:
-            Statistics().avg_unsat_path_len.record(
-                len(self.parser_path + control_path))
-            Statistics().count_unsat_paths.inc()
+            stats.avg_unsat_path_len.record(
+                len(self.parser_path) + len(control_path))
+            stats.count_unsat_paths.inc()
 
-        if Config().get_record_statistics():
-            Statistics().record(result, is_complete_control_path, self.path_solver)
+        if self.record_statistics:
+            stats.record(result, is_complete_control_path, self.path_solver)
 
         if record_path_result(result, is_complete_control_path):
-            path = (tuple(self.parser_path), tuple(control_path))
-            if path in self.results and self.results[path] != result:
+            path = (self.parser_path_tuple, tuple(control_path))
+            # Look up the existing result once, as each lookup hashes every
+            # transition along the path.
+            old_result = self.results.get(path)
+            if old_result is not None and old_result != result:
                 logging.error("result_path %s with result %s"
                               " is already recorded in results"
-                              " while trying to record different result %s"
-                              "" % (path,
-                                    self.results[path], result))
+                              " while trying to record different result %s",
+                              path, old_result, result)
                 #assert False
             self.results[path] = result
-            if result == TestPathResult.SUCCESS and is_complete_control_path:
+            if complete_success:
                 now = time.time()
                 self.success_path_count += 1
                 # Use real time to avoid printing these details
                 # too often in the output log.
-                if now - Statistics(
-                ).last_time_printed_stats_per_control_path_edge >= 30:
-                    Statistics().log_control_path_stats(
-                        Statistics().stats_per_control_path_edge,
-                        Statistics().num_control_path_edges)
-                    Statistics(
-                    ).last_time_printed_stats_per_control_path_edge = now
-            Statistics().stats[result] += 1
-
+                if now - stats.last_time_printed_stats_per_control_path_edge \
+                        >= 30:
+                    stats.log_control_path_stats()
+                    stats.last_time_printed_stats_per_control_path_edge = now
+            stats.stats[result] += 1
 
-    def visit_result(self, result):
         # TODO: Fix this option.
         if ge_than_not_none(self.success_path_count,
-                            Config().get_max_paths_per_parser_path()):
+                            self.max_paths_per_parser_path):
            return VisitResult.BACKTRACK
 
         if result != TestPathResult.SUCCESS:
@@ -194,8 +231,9 @@ class PathCoverageGraphVisitor(ControlGraphVisitor):
     def visit(self, control_path, is_complete_control_path):
         self.path_solver.push()
         path_result, path_model = self.solve_path(control_path, is_complete_control_path)
-        self.record_stats(control_path, is_complete_control_path, path_result)
-        return self.visit_result(path_result), path_model
+        visit_result = self.record_result(control_path,
+                                          is_complete_control_path, path_result)
+        return visit_result, path_model
 
     def backtrack(self):
         self.path_solver.pop()
@@ -209,19 +247,47 @@ class EdgeCoverageGraphVisitor(ControlGraphVisitor):
         )
         self.graph = graph
         self.done_edges = set()  # {edge}
-        self.edge_visits = defaultdict(int)  # {edge: visit_count}
+        # Only edges on a successful path are stored; reads use get() so that
+        # looking up an unvisited edge does not insert it.
+        self.edge_visits = {}  # {edge: visit_count}
+
+        # Number of child edges of each node that are not done, so that nodes
+        # whose child edges are all done can be spotted without scanning them.
+        # Edges compare equal by action or condition rather than by identity,
+        # so marking one edge done can mark several graph edges done.
+        # edge_srcs lists the source node of every graph edge equal to an edge.
+        self.num_children_not_done = {}  # {node: count}
+        self.edge_srcs = defaultdict(list)  # {edge: [node, ...]}
+        for node in graph.get_nodes():
+            child_edges = graph.get_neighbors(node)
+            self.num_children_not_done[node] = len(child_edges)
+            for edge in child_edges:
+                self.edge_srcs[edge].append(node)
+
+        # Number of unvisited edges in each prefix of the current control path,
+        # maintained as the DFS visits and backtracks.
+        self.num_unvisited_edges = []
+
+    def mark_done(self, edge):
+        if edge not in self.done_edges:
+            self.done_edges.add(edge)
+            for node in self.edge_srcs[edge]:
+                self.num_children_not_done[node] -= 1
 
     def preprocess_edges(self, _path, edges):
         # List non-done edges first, then done edges, with each group sorted by
-        # absolute visit count.
-        done_edges = []
-        non_done_edges = []
+        # absolute visit count.  Visit counts are small, so bucket the edges by
+        # count rather than sorting them.  Edges keep their relative order
+        # within a bucket, as with a stable sort.
+        done_buckets = defaultdict(list)  # {visit_count: [edge, ...]}
+        non_done_buckets = defaultdict(list)
         for e in edges:
-            l = done_edges if e in self.done_edges else non_done_edges
-            l.append(e)
-        least_visits_order = \
-            sorted(non_done_edges, key=lambda e: self.edge_visits[e]) + \
-            sorted(done_edges, key=lambda e: self.edge_visits[e])
+            buckets = done_buckets if e in self.done_edges else non_done_buckets
+            buckets[self.edge_visits.get(e, 0)].append(e)
+        least_visits_order = []
+        for buckets in (non_done_buckets, done_buckets):
+            for visit_count in sorted(buckets):
+                least_visits_order.extend(buckets[visit_count])
 
         # List is added to a LIFO stack, so reverse the list.
         return reversed(least_visits_order)
@@ -229,14 +295,20 @@ class EdgeCoverageGraphVisitor(ControlGraphVisitor):
     def visit(self, control_path, is_complete_control_path):
         self.path_solver.push()
 
+        num_unvisited = self.num_unvisited_edges[-1] \
+            if self.num_unvisited_edges else 0
+        if control_path[-1] not in self.edge_visits:
+            num_unvisited += 1
+        self.num_unvisited_edges.append(num_unvisited)
+
         # Skip any path that leads to a done branch and who's edges have already
         # all been visited.
-        if control_path[-1] in self.done_edges \
-                and all(self.edge_visits[e] > 0 for e in control_path):
+        if control_path[-1] in self.done_edges and num_unvisited == 0:
             return VisitResult.BACKTRACK, None
 
         path_result, path_model = self.solve_path(control_path, is_complete_control_path)
-        self.record_stats(control_path, is_complete_control_path, path_result)
+        visit_result = self.record_result(control_path,
+                                          is_complete_control_path, path_result)
 
         # Only increment counts and done edges if a non-error test case was
         # generated.  We want successful test cases in order to consider an edge
@@ -246,19 +318,20 @@ class EdgeCoverageGraphVisitor(ControlGraphVisitor):
             assert is_complete_control_path
             # Increment visit counts
             for edge in control_path:
-                self.edge_visits[edge] += 1
+                self.edge_visits[edge] = self.edge_visits.get(edge, 0) + 1
+            # Every prefix of the current path is now fully visited.
+            self.num_unvisited_edges = [0] * len(control_path)
 
             # Mark final edge as done
-            self.done_edges.add(control_path[-1])
+            self.mark_done(control_path[-1])
 
             # Mark all edges along graph with all child edges done as done.
             for edge in reversed(control_path[:-1]):
-                child_edges = self.graph.get_neighbors(edge.dst)
-                if all(ce in self.done_edges for ce in child_edges):
-                    self.done_edges.add(edge)
+                if self.num_children_not_done[edge.dst] == 0:
+                    self.mark_done(edge)
 
-        return self.visit_result(path_result), path_model
+        return visit_result, path_model
 
     def backtrack(self):
         self.path_solver.pop()
-
+        self.num_unvisited_edges.pop()
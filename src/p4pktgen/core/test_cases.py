@@ -130,9 +130,8 @@ class TestCaseBuilder(object):
                                 format(table_key.match_type))
 
         logging.debug("table_name %s"
-                      " table.default_entry.action_const %s" %
-                      (table_name,
-                       table.default_entry.action_const))
+                      " table.default_entry.action_const %s",
+                      table_name, table.default_entry.action_const)
 
         if (len(key_value_strs) == 0
                 and table.default_entry.action_const):
@@ -240,8 +239,8 @@ class TestCaseBuilder(object):
 
             packet_len_bytes = len(payload)
             packet_hexstr = ''.join([('%02x' % (x)) for x in payload])
-            logging.info("packet (%d bytes) %s"
-                         "" % (packet_len_bytes, packet_hexstr))
+            logging.info("packet (%d bytes) %s",
+                         packet_len_bytes, packet_hexstr)
 
             if uninitialized_reads:
                 result = TestPathResult.UNINITIALIZED_READ
@@ -265,11 +264,11 @@ class TestCaseBuilder(object):
                             "source_info", source_info_to_dict(source_info))]))
             else:
                 assert len(payload) >= Config().get_min_packet_len_generated()
-                logging.info('Found packet for path: {}'.format(path.expected_path))
+                logging.info('Found packet for path: %s', path.expected_path)
                 result = TestPathResult.SUCCESS
         else:
-            logging.info(
-                'Unable to find packet for path: {}'.format(path.expected_path))
+            logging.info('Unable to find packet for path: %s',
+                         path.expected_path)
             result = TestPathResult.NO_PACKET_FOUND
 
         if packet_hexstr is None:
@@ -360,12 +359,12 @@ class TestCaseBuilder(object):
 
             if expected_path != extracted_path:
                 logging.error('Expected and actual path differ')
-                logging.error('Expected: {}'.format(expected_path))
-                logging.error('Actual:   {}'.format(extracted_path))
+                logging.error('Expected: %s', expected_path)
+                logging.error('Actual:   %s', extracted_path)
                 result = TestPathResult.TEST_FAILED
                 assert False
             else:
-                logging.info('Test successful: {}'.format(expected_path))
+                logging.info('Test successful: %s', expected_path)
         return result
 
     def test_packet(self, packet, ss_cli_setup_cmds, source_info_to_node_name):
@@ -431,7 +431,7 @@ class Translator(object):
                                 " (%d != %d bits) lhs %s source_info %s"
                                 "" % (primitive.op, dest_size, value.size(), field,
                                       primitive.source_info))
-                            logging.debug("    value %s" % (value))
+                            logging.debug("    value %s", value)
                         if dest_size > value.size():
                             value = ZeroExt(dest_size - value.size(), value)
                         else:
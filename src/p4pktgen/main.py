@@ -101,6 +101,15 @@ def main():
         action='store_false',
         default=True,
         help='Do not use incremental solving')
+    parser.add_argument(
+        '-osc',
+        '--one-shot-complete-paths',
+        dest='one_shot_complete_paths',
+        action='store_true',
+        default=False,
+        help=
+        """With this option given, when solving incrementally, solve each complete control path with a new non-incremental solver, which can apply preprocessing that incremental solving disables, and tune the incremental solver used for partial paths for many small queries.  Without this option (the default), all paths are solved with the same incremental solver.  Has no effect with --no-incremental."""
+    )
     parser.add_argument(
         '-aup',
         '--allow-unimplemented-primitives',
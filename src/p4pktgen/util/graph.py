@@ -41,6 +41,9 @@ class Graph:
     def __init__(self):
         self.graph = {}
         self.in_edges = {}
+        # Every edge added to the graph, indexed by the edge_id assigned to it
+        # by add_edge.
+        self.edges = []
 
     def num_edges(self):
         count = 0
@@ -53,8 +56,11 @@ class Graph:
     # Graph's use case, and not worrying about the finer details.
     def __deepcopy__(self, memo_dict):
         ret = Graph()
-        ret.graph = copy.deepcopy(self.graph)
-        ret.in_edges = copy.deepcopy(self.in_edges)
+        # Share the memo so that each edge is copied once, and the copy's
+        # adjacency lists and edges list refer to the same edge objects.
+        ret.graph = copy.deepcopy(self.graph, memo_dict)
+        ret.in_edges = copy.deepcopy(self.in_edges, memo_dict)
+        ret.edges = copy.deepcopy(self.edges, memo_dict)
         return ret
 
     def add_node(self, v):
@@ -71,6 +77,9 @@ class Graph:
         self.add_node(dst)
         self.graph[src].append(edge)
         self.in_edges[dst].append(edge)
+        # Small integer ids let callers keep per-edge data in lists.
+        edge.edge_id = len(self.edges)
+        self.edges.append(edge)
 
     def get_nodes(self):
         """Return a list of nodes in the graph."""
@@ -240,6 +249,12 @@ class Graph:
         assert bkwd_e is not None
         del self.graph[src_node][fwd_idx]
         del self.in_edges[dst_node][bkwd_idx]
+        # Keep self.edges compact by moving the last edge into the removed
+        # edge's slot.
+        last_e = self.edges.pop()
+        if last_e is not fwd_e:
+            last_e.edge_id = fwd_e.edge_id
+            self.edges[last_e.edge_id] = last_e
         # Add an edge in the opposite direction
         new_e = Edge(dst_node, src_node)
         self.add_edge(new_e.src, new_e.dst, new_e)
@@ -1,3 +1,4 @@
+import array
 import logging
 import time
 from collections import defaultdict
@@ -23,18 +24,18 @@ class Timer(Statistic):
     def __init__(self, name):
         super(Timer, self).__init__(name)
         self.start_time = None
-        self.time = 0
+        self.time_ns = 0
 
     def start(self):
         assert self.start_time == None
-        self.start_time = time.time()
+        self.start_time = time.monotonic_ns()
 
     def stop(self):
-        self.time += time.time() - self.start_time
+        self.time_ns += time.monotonic_ns() - self.start_time
         self.start_time = None
 
     def get_time(self):
-        return self.time
+        return self.time_ns * 1e-9
 
     def __repr__(self):
         return '{}: {}s'.format(self.name, self.get_time())
@@ -78,7 +79,8 @@ class Statistics:
 
         self.start_time = time.time()
         self.stats = defaultdict(int)
-        self.stats_per_control_path_edge = defaultdict(int)
+        self.control_path_edges = []
+        self.stats_per_control_path_edge = array.array('Q')
         self.last_time_printed_stats_per_control_path_edge = self.start_time
         self.record_count = 0
 
@@ -88,6 +90,13 @@ class Statistics:
         self.num_covered_edges = 0
         self.num_done = 0
 
+    def init_control_path_edges(self, edges):
+        """Sets the control path edges to collect statistics for.  The count
+        for each edge is kept in stats_per_control_path_edge, indexed by its
+        edge_id."""
+        self.control_path_edges = edges
+        self.stats_per_control_path_edge = array.array('Q', [0]) * len(edges)
+
     def record(self, result, record_path, path_solver):
         self.record_count += 1
 
@@ -108,24 +117,26 @@ class Statistics:
                 self.count_unsat_paths.counter))
             self.breakdown_file.flush()
 
-    def log_control_path_stats(self, stats_per_control_path_edge,
-                               num_control_path_edges):
+    def log_control_path_stats(self):
+        num_control_path_edges = self.num_control_path_edges
         logging.info(
             "Number of times each of %d control path edges has occurred"
             " in a SUCCESS test case:", num_control_path_edges)
         num_edges_with_count = defaultdict(int)
         num_edges_with_counts = 0
-        for e in sorted(stats_per_control_path_edge.keys(), key=id):
+        for e in self.control_path_edges:
+            cnt = self.stats_per_control_path_edge[e.edge_id]
+            if cnt == 0:
+                continue
             num_edges_with_counts += 1
-            cnt = stats_per_control_path_edge[e]
             num_edges_with_count[cnt] += 1
-            logging.info("    %d %s" % (cnt, e))
+            logging.info("    %d %s", cnt, e)
         num_edges_without_counts = num_control_path_edges - num_edges_with_counts
         num_edges_with_count[0] += num_edges_without_counts
         logging.info("Number of control path edges covered N times:")
         for c in sorted(num_edges_with_count.keys()):
-            logging.info("    %d edges occurred in %d SUCCESS test cases"
-                         "" % (num_edges_with_count[c], c))
+            logging.info("    %d edges occurred in %d SUCCESS test cases",
+                         num_edges_with_count[c], c)
 
     def dump(self):
         print('num_control_path_edges', self.num_control_path_edges)
@@ -4,23 +4,38 @@ from scapy.all import *
 
 
 class TestCaseWriter:
+    # Test cases are buffered and written out in batches of this many, so that
+    # an interrupted run still leaves most of its output on disk.
+    flush_interval = 64
+    json_buffer_size = 128 * 1024
+
     def __init__(self, json_fn, pcap_fn):
-        self.test_casesf = open(json_fn, 'w')
+        self.test_casesf = open(json_fn, 'w', buffering=self.json_buffer_size)
         self.test_casesf.write('[\n')
         self.test_pcapf = RawPcapWriter(pcap_fn, linktype=0)
         self.test_pcapf._write_header(None)
         self.first = True
+        self.pending = []  # [(test_case, packet_lst), ...]
 
     def write(self, test_case, packet_lst):
-        if not self.first:
-            self.test_casesf.write(',\n')
-        json.dump(test_case, self.test_casesf, indent=2)
-        for p in packet_lst:
-            self.test_pcapf._write_packet(p)
+        self.pending.append((test_case, packet_lst))
+        if len(self.pending) >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        for test_case, packet_lst in self.pending:
+            if not self.first:
+                self.test_casesf.write(',\n')
+            self.test_casesf.write(json.dumps(test_case, indent=2))
+            for p in packet_lst:
+                self.test_pcapf._write_packet(p)
+            self.first = False
+        self.pending = []
+        self.test_casesf.flush()
         self.test_pcapf.flush()
-        self.first = False
 
     def cleanup(self):
+        self.flush()
         self.test_casesf.write('\n]\n')
         self.test_casesf.close()
         self.test_pcapf.close()
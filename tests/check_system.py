@@ -62,6 +62,7 @@ def load_test_config(no_packet_length_errs=True,
     config.conditional_opt = True
     config.table_opt = True
     config.incremental = True
+    config.one_shot_complete_paths = False
     config.output_path = './test-case'
     config.round_robin_parser_paths = False
     config.collapse_parser_paths = False
@@ -265,6 +266,20 @@ class CheckSystem:
         expected_results = self.demo9b_expected_results
         assert results == expected_results
 
+    def check_demo9b_one_shot_complete_paths(self, config):
+        load_test_config(**config)
+        Config().one_shot_complete_paths = True
+        results = run_test('examples/demo9b.json')
+        expected_results = self.demo9b_expected_results
+        assert results == expected_results
+
+    def check_demo9b_not_incremental(self, config):
+        load_test_config(**config)
+        Config().incremental = False
+        results = run_test('examples/demo9b.json')
+        expected_results = self.demo9b_expected_results
+        assert results == expected_results
+
     def check_config_table(self, config):
         load_test_config(**config)
         results = run_test('examples/config-table.json')
@@ -543,6 +558,15 @@ class CheckSystem:
         assert counts == expected_counts
 
 
+    def check_parser_parallel_paths_not_incremental(self, config):
+        load_test_config(**config)
+        Config().incremental = False
+        results = run_test('examples/parser-parallel-paths.json', results_as_list=True)
+        expected_counts = result_counts(self.parser_parallel_path_expected_results)
+        counts = result_counts(results)
+        assert counts == expected_counts
+
+
     def check_parser_parallel_paths_collapsed(self, config):
         load_test_config(**config)
         Config().collapse_parser_paths = True